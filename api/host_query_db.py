@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import re
 from collections.abc import Iterator
 from copy import deepcopy
 from itertools import islice
@@ -9,8 +8,10 @@ from typing import Any
 from sqlalchemy import Boolean
 from sqlalchemy import Integer
 from sqlalchemy import case
+from sqlalchemy import column
 from sqlalchemy import func
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import MultipleResultsFound
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Query
@@ -422,37 +423,56 @@ def get_tag_list(
         order_by,
         get_current_identity(),
     )
-    query = _find_hosts_entities_query(query=query_base, columns=columns)
-
-    query_results = query.filter(*all_filters).all()
-    db.session.close()
-    _, host_tags_dict = _expand_host_tags(query_results)
-    host_tags = host_tags_dict
+    hosts = _find_hosts_entities_query(query=query_base, columns=columns).filter(*all_filters).subquery("hosts")
+
+    # Expand the nested {namespace: {key: [values]}} tags of every matching host into one row per tag.
+    # A key without values still produces a single row with a NULL value, and a scalar value is kept as is.
+    namespaces = func.jsonb_each(hosts.c.tags).table_valued("key", column("value", JSONB)).lateral("namespaces")
+    keys = func.jsonb_each(namespaces.c.value).table_valued("key", column("value", JSONB)).lateral("keys")
+    null_value = expression.literal_column("'[null]'::jsonb", JSONB)
+    key_values = case(
+        (func.jsonb_typeof(keys.c.value) == "null", null_value),
+        (func.jsonb_typeof(keys.c.value) != "array", func.jsonb_build_array(keys.c.value)),
+        (keys.c.value == expression.literal_column("'[]'::jsonb", JSONB), null_value),
+        else_=keys.c.value,
+    )
+    values = func.jsonb_array_elements_text(key_values).table_valued("value").lateral("tag_values")
+
+    tag_namespace = func.nullif(namespaces.c.key, "null")
+    tag_key = func.nullif(keys.c.key, "null")
+    tag_value = func.nullif(values.c.value, "null")
+    tag_string = func.concat(
+        func.coalesce(tag_namespace, "None"),
+        "/",
+        func.coalesce(tag_key, "None"),
+        "=",
+        case((values.c.value == "null", "None"), else_=func.coalesce(values.c.value, "")),
+    ).collate("C")
+
+    tags_query = (
+        select(tag_namespace, tag_key, tag_value, func.count().label("count"))
+        .select_from(hosts)
+        .join(namespaces, expression.true())
+        .join(keys, expression.true())
+        .join(values, expression.true())
+        .group_by(namespaces.c.key, keys.c.key, values.c.value)
+    )
     if search:
-        regex = re.compile(search, re.IGNORECASE)
-        host_tags = {}
-        for key in host_tags_dict.keys():
-            if regex.search(key):
-                host_tags[key] = host_tags_dict[key]
-
-    tag_list = []
-    query_count = 0
-    tag_count_list = []
-    for stored_key, tag_contents in host_tags.items():
-        tag_count_item = {"tag": stored_key, "count": len(tag_contents.get("hosts"))}
-        tag_count_list.append(tag_count_item)
+        tags_query = tags_query.where(tag_string.regexp_match(search, flags="i"))
+
     if order_by == "tag":
-        sorted_tag_count_list = sorted(tag_count_list, reverse=order_how == "DESC", key=lambda item: item["tag"])
-    if order_by == "count":
-        sorted_tag_count_list = sorted(tag_count_list, reverse=order_how == "DESC", key=lambda item: item["count"])
-    for tag_item in sorted_tag_count_list:
-        tag_key = tag_item.get("tag")
-        tag_dict = host_tags[tag_key]
-        output = {"tag": tag_dict.get("output", {}), "count": len(tag_dict.get("hosts", []))}
-        tag_list.append(output)
-
-    query_count = len(tag_list)
-    tag_list = list(islice(islice(tag_list, offset, None), limit))
+        order: tuple[Any, ...] = (_order_how(tag_string, order_how or "ASC"),)
+    else:
+        order = (_order_how(func.count(), order_how or "ASC"), tag_string.asc())
+
+    query_count = db.session.execute(select(func.count()).select_from(tags_query.subquery())).scalar_one()
+    query_results = db.session.execute(tags_query.order_by(*order).offset(offset).limit(limit)).all()
+    db.session.close()
+
+    tag_list = [
+        {"tag": {"namespace": namespace, "key": key, "value": value}, "count": count}
+        for namespace, key, value, count in query_results
+    ]
     return tag_list, query_count
 
 
@@ -583,36 +603,22 @@ def get_sap_sids_info(
         join_dynamic_profile=True,  # Explicitly request HostDynamicSystemProfile join
     )
 
-    sap_sids_query = _find_hosts_entities_query(query_base, columns)
+    sap_sids_query = _find_hosts_entities_query(query_base, columns).filter(*filters).subquery("host_sap_sids")
+    sap_sid = sap_sids_query.c.sap_sids
 
-    query_results = sap_sids_query.filter(*filters).all()
-    db.session.close()
-    sap_sids = {}
-    for result in query_results:
-        host_id = result[0]
-        sap_sid = result[1]
-        if sap_sid not in sap_sids:
-            sap_sids[sap_sid] = {host_id}
-        else:
-            sap_sids[sap_sid].add(host_id)
-
-    sap_sids_dict = sap_sids
+    sap_sids_count_query = select(sap_sid, func.count(sap_sids_query.c.id.distinct()).label("count")).group_by(sap_sid)
     if search:
-        regex = re.compile(search, re.IGNORECASE)
-        sap_sids_dict = {}
-        for key in sap_sids.keys():
-            if regex.search(key):
-                sap_sids_dict[key] = sap_sids[key]
-
-    sap_sids_list = []
-    query_count = 0
-    sap_sids_count_list = []
-    for sap_sid, host_list in sap_sids_dict.items():
-        sap_sid_count_item = {"value": sap_sid, "count": len(host_list)}
-        sap_sids_count_list.append(sap_sid_count_item)
-    sap_sids_count_list = sorted(sap_sids_count_list, reverse=True, key=lambda item: item["count"])
-    query_count = len(sap_sids_count_list)
-    sap_sids_list = list(islice(islice(sap_sids_count_list, offset, None), limit))
+        sap_sids_count_query = sap_sids_count_query.where(sap_sid.regexp_match(search, flags="i"))
+
+    query_count = db.session.execute(select(func.count()).select_from(sap_sids_count_query.subquery())).scalar()
+    query_results = db.session.execute(
+        sap_sids_count_query.order_by(func.count(sap_sids_query.c.id.distinct()).desc(), sap_sid.asc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    db.session.close()
+
+    sap_sids_list = [{"value": sap_sid_value, "count": count} for sap_sid_value, count in query_results]
     return sap_sids_list, query_count
 
 
@@ -830,8 +836,9 @@ def get_hosts_to_export(
 
     except SQLAlchemyError as e:  # Most likely ObjectDeletedError, but catching all DB errors
         raise InventoryException(title="DB Error", detail=str(e)) from e
-
-    db.session.close()
+    finally:
+        # Also runs when the consumer stops iterating early and closes the generator
+        db.session.close()
 
 
 def _get_group_name_order_post_kessel(order_how):
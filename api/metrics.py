@@ -12,3 +12,9 @@ outbound_http_response_time = Histogram(
     ["dependency"],
 )
 api_cached_systems_hit = Counter("inventory_api_cached_systems_hit_count", "The total amount of system cache hits")
+staleness_cache_hit = Counter(
+    "inventory_staleness_cache_hit_count", "The total amount of org staleness lookups served from the cache"
+)
+staleness_cache_miss = Counter(
+    "inventory_staleness_cache_miss_count", "The total amount of org staleness lookups that queried the database"
+)
@@ -1,5 +1,18 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
 from sqlalchemy.orm.exc import NoResultFound
 
+from api.metrics import staleness_cache_hit
+from api.metrics import staleness_cache_miss
+from app.common import inventory_config
 from app.logging import get_logger
 from app.models import Staleness
 from app.models import db
@@ -9,15 +22,177 @@ from app.staleness_serialization import build_staleness_sys_default
 
 logger = get_logger(__name__)
 
+STALENESS_CHANGED_CHANNEL = "staleness_changed"
 
-def get_staleness_obj(org_id: str) -> AttrDict:
+# Cached for orgs without custom staleness; their values are rebuilt from the config on every call.
+# It is only ever compared by identity.
+_NO_CUSTOM_STALENESS = AttrDict()
+
+
+class StalenessCache:
+    """
+    Bounded LRU cache of serialized staleness objects, keyed by org_id.
+    Entries expire after ttl seconds, so a missed invalidation is never stale for longer than that.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, AttrDict]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, org_id: str) -> AttrDict | None:
+        with self._lock:
+            entry = self._entries.get(org_id)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[org_id]
+                return None
+            self._entries.move_to_end(org_id)
+            return value
+
+    def set(self, org_id: str, value: AttrDict) -> None:
+        with self._lock:
+            self._entries[org_id] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(org_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, org_id: str | None = None) -> None:
+        with self._lock:
+            if org_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(org_id, None)
+
+
+class _StalenessChangeListener:
+    """
+    LISTENs on STALENESS_CHANGED_CHANNEL with a dedicated connection, so that staleness changes made by
+    other processes invalidate this process's cache. Notifications are drained whenever the cache is read,
+    which costs a non-blocking socket read instead of a query.
+    The connection is shared by all threads of the process, so it is only used while holding the lock.
+    """
+
+    RECONNECT_INTERVAL = 30
+
+    def __init__(self):
+        self._conn = None
+        self._pid = None
+        self._next_connect_attempt = 0.0
+        self._lock = Lock()
+
+    def drain(self, cache: StalenessCache) -> None:
+        with self._lock:
+            self._drain(cache)
+
+    def _drain(self, cache: StalenessCache) -> None:
+        if self._pid != os.getpid():
+            # Never share the connection with a forked parent
+            self._conn = None
+            self._pid = os.getpid()
+
+        if self._conn is None or self._conn.closed:
+            self._connect(cache)
+            return
+
+        try:
+            self._conn.poll()
+        except psycopg2.Error as e:
+            logger.warning(f"Lost the staleness change listener connection: {e}")
+            self._conn = None
+            cache.invalidate()
+            return
+
+        for notify in self._conn.notifies:
+            logger.debug(f"Staleness change notification received for org {notify.payload}")
+            cache.invalidate(notify.payload)
+        self._conn.notifies.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and not self._conn.closed:
+                self._conn.close()
+            self._conn = None
+
+    def _connect(self, cache: StalenessCache) -> None:
+        if time.monotonic() < self._next_connect_attempt:
+            return
+
+        self._next_connect_attempt = time.monotonic() + self.RECONNECT_INTERVAL
+        try:
+            conn = psycopg2.connect(inventory_config().db_uri)
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {STALENESS_CHANGED_CHANNEL};")
+        except psycopg2.Error as e:
+            logger.warning(f"Could not start the staleness change listener: {e}")
+            return
+
+        self._conn = conn
+        # Anything cached before the LISTEN could have missed a notification
+        cache.invalidate()
+
+
+_staleness_cache: StalenessCache | None = None
+_staleness_change_listener = _StalenessChangeListener()
+
+
+def _get_staleness_cache() -> StalenessCache | None:
+    global _staleness_cache
+
+    config = inventory_config()
+    if config.staleness_cache_ttl_seconds <= 0:
+        return None
+    if _staleness_cache is None:
+        _staleness_cache = StalenessCache(config.staleness_cache_max_size, config.staleness_cache_ttl_seconds)
+    return _staleness_cache
+
+
+def invalidate_staleness_cache(org_id: str | None = None) -> None:
+    if _staleness_cache is not None:
+        _staleness_cache.invalidate(org_id)
+
+
+def close_staleness_change_listener() -> None:
+    _staleness_change_listener.close()
+
+
+def notify_staleness_changed(org_id: str) -> None:
+    # Sent as part of the current transaction, so other processes are only notified once it commits
+    db.session.execute(
+        text("SELECT pg_notify(:channel, :org_id)"), {"channel": STALENESS_CHANGED_CHANNEL, "org_id": org_id}
+    )
+
+
+def _get_staleness_from_db(org_id: str) -> AttrDict | None:
     try:
         staleness = db.session.query(Staleness).filter(Staleness.org_id == org_id).one()
         logger.info(f"Using custom staleness for org {org_id}.")
-        staleness = build_serialized_acc_staleness_obj(staleness)
+        return build_serialized_acc_staleness_obj(staleness)
     except NoResultFound:
+        return None
+
+
+def get_staleness_obj(org_id: str) -> AttrDict:
+    cache = _get_staleness_cache()
+    if cache is None:
+        staleness = _get_staleness_from_db(org_id)
+    else:
+        _staleness_change_listener.drain(cache)
+        staleness = cache.get(org_id)
+        if staleness is None:
+            staleness_cache_miss.inc()
+            staleness = _get_staleness_from_db(org_id)
+            cache.set(org_id, _NO_CUSTOM_STALENESS if staleness is None else staleness)
+        else:
+            staleness_cache_hit.inc()
+
+    if staleness is None or staleness is _NO_CUSTOM_STALENESS:
         logger.debug(f"No custom staleness data found for org {org_id}, using system default values instead.")
-        staleness = build_staleness_sys_default(org_id)
-        return staleness
+        return build_staleness_sys_default(org_id)
 
-    return staleness
+    # Callers get their own copy, so they can never modify the cached object
+    return AttrDict(staleness)
@@ -15,12 +15,22 @@ def _encode_headers(headers):
     return [(hk, (hv or "").encode("utf-8")) for hk, hv in headers.items()]
 
 
+class DeliveryReport:
+    """Delivery outcome of the events queued since the last EventProducer.flush_queued() call."""
+
+    def __init__(self):
+        self.queued = 0
+        self.delivered = 0
+        self.failed = 0
+
+
 class MessageDetails:
-    def __init__(self, topic: str, event: str, headers: list[tuple], key: str):
+    def __init__(self, topic: str, event: str, headers: list[tuple], key: str, report: DeliveryReport | None = None):
         self.event = event
         self.headers = headers
         self.key = key
         self.topic = topic
+        self.report = report
 
     def on_delivered(self, error, message):
         message_to_send = None
@@ -29,9 +39,13 @@ class MessageDetails:
                 message_to_send = message
                 produce_large_message_failure.inc()
             message_not_produced(logger, error, self.topic, self.event, self.key, self.headers, message_to_send)
+            if self.report is not None:
+                self.report.failed += 1
         else:
             produced_message_size.observe(len(str(message).encode("utf-8")))
             message_produced(logger, message, self.headers)
+            if self.report is not None:
+                self.report.delivered += 1
 
 
 class NullEventProducer:
@@ -47,6 +61,14 @@ class NullEventProducer:
             "NullEventProducer: Skipping event production in replica cluster. Topic: %s, key: %s", self.mq_topic, key
         )
 
+    def queue_event(self, event, key, headers):
+        logger.debug(
+            "NullEventProducer: Skipping event production in replica cluster. Topic: %s, key: %s", self.mq_topic, key
+        )
+
+    def flush_queued(self, timeout=None):
+        return DeliveryReport()
+
     def close(self):
         logger.debug("NullEventProducer: Closing (no-op)")
 
@@ -56,6 +78,7 @@ class EventProducer:
         logger.info("Starting EventProducer()")
         self._kafka_producer = KafkaProducer({"bootstrap.servers": config.bootstrap_servers, **config.kafka_producer})
         self.mq_topic = topic
+        self._batch_report = DeliveryReport()
 
     def write_event(self, event, key, headers, *, wait=False):
         logger.debug("Topic: %s, key: %s, event: %s, headers: %s", self.mq_topic, key, event, headers)
@@ -81,6 +104,54 @@ class EventProducer:
             message_not_produced(logger, error, topic, event=v, key=k, headers=h)
             raise error
 
+    def queue_event(self, event, key, headers):
+        """
+        Enqueue an event without waiting for its delivery report.
+
+        Events queued this way are sent in the background by librdkafka; call flush_queued()
+        once per batch to wait for all of them and collect their delivery outcome.
+        """
+        logger.debug("Topic: %s, key: %s, event: %s, headers: %s", self.mq_topic, key, event, headers)
+
+        k = key.encode("utf-8") if key else None
+        v = event.encode("utf-8")
+        h = _encode_headers(headers)
+        topic = self.mq_topic
+        message_details = MessageDetails(topic, v, h, k, report=self._batch_report)
+
+        try:
+            try:
+                self._kafka_producer.produce(topic, v, k, callback=message_details.on_delivered, headers=h)
+            except BufferError:
+                # The local producer queue is full; serve delivery reports to make room and retry once
+                self._kafka_producer.poll(1)
+                self._kafka_producer.produce(topic, v, k, callback=message_details.on_delivered, headers=h)
+            self._batch_report.queued += 1
+            self._kafka_producer.poll(0)
+        except Exception as error:
+            message_not_produced(logger, error, topic, event=v, key=k, headers=h)
+            raise error
+
+    def flush_queued(self, timeout=None) -> DeliveryReport:
+        """Flush all events queued with queue_event() and return their delivery report."""
+        batch_report, self._batch_report = self._batch_report, DeliveryReport()
+        if timeout is None:
+            self._kafka_producer.flush()
+        else:
+            self._kafka_producer.flush(timeout)
+
+        # Late delivery callbacks only update batch_report, which is discarded here.
+        # Whatever has not been acknowledged by now is reported as failed.
+        report = DeliveryReport()
+        report.queued = batch_report.queued
+        report.delivered = batch_report.delivered
+        report.failed = batch_report.queued - batch_report.delivered
+        if report.failed > batch_report.failed:
+            logger.warning(
+                "%s queued events were still in flight after the flush", report.failed - batch_report.failed
+            )
+        return report
+
     def close(self):
         self._kafka_producer.flush()
 
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Generator
+from collections.abc import Iterable
+from collections.abc import Iterator
 from http import HTTPStatus
+from itertools import chain
 from uuid import UUID
 
 from requests import Response
@@ -20,7 +24,7 @@ from app.exceptions import InventoryException
 from app.logging import get_logger
 from lib import metrics
 from lib.middleware import get_rbac_filter
-from utils.json_to_csv import json_arr_to_csv
+from utils.json_to_csv import json_iter_to_csv
 
 logger = get_logger(__name__)
 
@@ -54,17 +58,13 @@ def build_headers(
     return rbac_request_headers, request_headers
 
 
-def get_host_list(identity: Identity, rbac_filter: dict | None, inventory_config: Config) -> list[dict]:
-    host_data = list(
-        get_hosts_to_export(
-            identity,
-            rbac_filter=rbac_filter,
-            batch_size=inventory_config.export_svc_batch_size,
-        )
+def get_host_list(identity: Identity, rbac_filter: dict | None, inventory_config: Config) -> Iterator[dict]:
+    return get_hosts_to_export(
+        identity,
+        rbac_filter=rbac_filter,
+        batch_size=inventory_config.export_svc_batch_size,
     )
 
-    return host_data
-
 
 @metrics.create_export_processing_time.time()
 def create_export(
@@ -96,6 +96,7 @@ def create_export(
 
     export_created = False
     session = Session()
+    host_data = None
 
     if not allowed:
         request_url = _build_export_request_url(
@@ -116,6 +117,8 @@ def create_export(
     try:
         # create a generator with serialized host data
         host_data = get_host_list(identity, rbac_filter, inventory_config)
+        # Fetch the first host up front, so that an empty export is reported as an error instead of uploaded
+        first_host = next(host_data, None)
 
         request_url = _build_export_request_url(
             export_service_endpoint, exportUUID, applicationName, resourceUUID, "upload"
@@ -125,15 +128,16 @@ def create_export(
 
         logger.info(f"Trying to get data for org_id: {identity.org_id}")
 
-        if host_data:
+        if first_host is not None:
             logger.debug(f"Trying to upload data using URL:{request_url}")
-            logger.info(
-                f"{len(host_data)} hosts will be exported (format: {exportFormat}) for org_id {identity.org_id}"
-            )
+            logger.info(f"Streaming hosts to export (format: {exportFormat}) for org_id {identity.org_id}")
+            # A generator body is sent with chunked transfer encoding, one chunk per batch of hosts
             response = session.post(
                 url=request_url,
                 headers=request_headers,
-                data=_format_export_data(host_data, exportFormat).encode("utf-8"),
+                data=_stream_export_data(
+                    chain((first_host,), host_data), exportFormat, inventory_config.export_svc_batch_size
+                ),
             )
             _handle_export_response(response, exportUUID, exportFormat)
             export_created = True
@@ -157,6 +161,9 @@ def create_export(
         export_created = False
     finally:
         session.close()
+        if isinstance(host_data, Generator):
+            # Releases the DB session of the host query even if the upload stopped mid-stream
+            host_data.close()
 
     return export_created
 
@@ -193,9 +200,26 @@ def _handle_export_response(response: Response, exportUUID: UUID, exportFormat:
         logger.info(f"{response.text} for export ID {str(exportUUID)} in {exportFormat.upper()} format")
 
 
-def _format_export_data(data: list[dict], exportFormat: str) -> str:
+def _iter_export_data(data: Iterable[dict], exportFormat: str) -> Iterator[str]:
     if exportFormat == "json":
-        return json.dumps(data)
+        # Same output as json.dumps(list(data)), written one host at a time
+        yield "["
+        for index, host in enumerate(data):
+            yield f", {json.dumps(host)}" if index else json.dumps(host)
+        yield "]"
     elif exportFormat == "csv":
-        return json_arr_to_csv(data)
-    raise ValueError(f"Unsupported export format: {exportFormat}")
+        yield from json_iter_to_csv(data)
+    else:
+        raise ValueError(f"Unsupported export format: {exportFormat}")
+
+
+def _stream_export_data(data: Iterable[dict], exportFormat: str, batch_size: int) -> Iterator[bytes]:
+    chunk: list[str] = []
+    for piece in _iter_export_data(data, exportFormat):
+        chunk.append(piece)
+        if len(chunk) >= batch_size:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
@@ -5,6 +5,7 @@ import json
 import sys
 import time
 import uuid
+from collections import defaultdict
 from collections.abc import Callable
 from contextlib import suppress
 from copy import deepcopy
@@ -224,6 +225,9 @@ class HBIMessageConsumerBase:
         """
         raise NotImplementedError("Not implemented in the HBIMessageConsumerBase class")
 
+    def pre_process_messages(self, messages: list) -> None:
+        pass  # No action is taken by default
+
     def post_process_rows(self) -> None:
         pass  # No action is taken by default
 
@@ -239,6 +243,7 @@ class HBIMessageConsumerBase:
                 num_messages=inventory_config().mq_db_batch_max_messages,
                 timeout=inventory_config().mq_db_batch_max_seconds,
             )
+            self.pre_process_messages(messages)
 
             for msg in messages:
                 if msg is None:
@@ -464,6 +469,28 @@ class HostMessageConsumer(HBIMessageConsumerBase):
 
 
 class IngressMessageConsumer(HostMessageConsumer):
+    dedup_index: host_repository.HostDedupIndex | None = None
+
+    def pre_process_messages(self, messages: list) -> None:
+        """
+        Load the existing hosts matching the ID facts of the whole batch upfront,
+        so that each message doesn't need its own deduplication queries.
+        """
+        hosts_by_org: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for msg in messages:
+            if msg is None or msg.error():
+                continue
+            try:
+                host_data = json.loads(msg.value())["data"]
+                hosts_by_org[host_data["org_id"]].append(host_data)
+            except Exception:
+                # Invalid messages are reported when they are handled
+                continue
+
+        self.dedup_index = host_repository.HostDedupIndex()
+        for org_id, hosts in hosts_by_org.items():
+            self.dedup_index.prefetch(org_id, hosts)
+
     def process_message(
         self,
         host_data: dict[str, Any],
@@ -495,7 +522,11 @@ class IngressMessageConsumer(HostMessageConsumer):
             log_add_host_attempt(logger, input_host, sp_fields_to_log, identity)
             processed_hosts = [result.row for result in self.processed_rows]
             host_row, add_result = host_repository.add_host(
-                input_host, identity, operation_args=operation_args, existing_hosts=processed_hosts
+                input_host,
+                identity,
+                operation_args=operation_args,
+                existing_hosts=processed_hosts,
+                dedup_index=self.dedup_index,
             )
 
             # Set owner_id on the persisted host
@@ -986,7 +1017,17 @@ def sync_event_message(message, session, event_producer):
     return
 
 
-def write_delete_event_message(event_producer: EventProducer, result: OperationResult, initiated_by_frontend: bool):
+def _write_or_queue_event(event_producer: EventProducer, event: str, key: str, headers: dict, wait: bool) -> None:
+    if wait:
+        event_producer.write_event(event, key, headers, wait=True)
+    else:
+        # The caller is responsible for calling event_producer.flush_queued() afterwards
+        event_producer.queue_event(event, key, headers)
+
+
+def write_delete_event_message(
+    event_producer: EventProducer, result: OperationResult, initiated_by_frontend: bool, *, wait: bool = True
+):
     event = build_event(
         EventType.delete,
         result.row,
@@ -1002,7 +1043,7 @@ def write_delete_event_message(event_producer: EventProducer, result: OperationR
         os_name,
         bootc_booted,
     )
-    event_producer.write_event(event, str(result.row.id), headers, wait=True)
+    _write_or_queue_event(event_producer, event, str(result.row.id), headers, wait)
     insights_id = serialize_uuid(result.row.insights_id)
     owner_id = serialize_uuid(result.row.static_system_profile.owner_id) if result.row.static_system_profile else None
     if insights_id and owner_id:
@@ -1011,7 +1052,11 @@ def write_delete_event_message(event_producer: EventProducer, result: OperationR
 
 
 def write_add_update_event_message(
-    event_producer: EventProducer, notification_event_producer: EventProducer, result: OperationResult
+    event_producer: EventProducer,
+    notification_event_producer: EventProducer,
+    result: OperationResult,
+    *,
+    wait: bool = True,
 ):
     if result.event_type is None or result.platform_metadata is None:
         # This should never happen, but OperationResult allows None values for these fields.
@@ -1042,7 +1087,7 @@ def write_add_update_event_message(
             str(output_host.get("system_profile", {}).get("bootc_status", {}).get("booted") is not None),
         )
 
-    event_producer.write_event(event, str(result.row.id), headers, wait=True)
+    _write_or_queue_event(event_producer, event, str(result.row.id), headers, wait)
 
     if result.event_type.name == HOST_EVENT_TYPE_CREATED:
         # Notifications are expected to omit null canonical facts
@@ -1051,6 +1096,7 @@ def write_add_update_event_message(
             notification_event_producer,
             notification_type=NotificationType.new_system_registered,
             host=output_host,
+            wait=wait,
         )
     result.success_logger(output_host)
 
@@ -1075,14 +1121,37 @@ def write_message_batch(
     notification_event_producer: EventProducer,
     processed_rows: list[OperationResult],
 ):
+    # Queue the events for the whole batch and wait for the broker only once,
+    # instead of paying a full producer flush for every single host.
     for result in processed_rows:
         if result is not None:
             try:
-                write_add_update_event_message(event_producer, notification_event_producer, result)
+                write_add_update_event_message(event_producer, notification_event_producer, result, wait=False)
             except Exception as exc:
                 metrics.ingress_message_handler_failure.inc()
                 logger.exception("Error while producing message", exc_info=exc)
 
+    for producer, description in (
+        (event_producer, "host events"),
+        (notification_event_producer, "notifications"),
+    ):
+        try:
+            with metrics.ingress_event_batch_flush_time.time():
+                delivery_report = producer.flush_queued()
+        except Exception as exc:
+            metrics.ingress_message_handler_failure.inc()
+            logger.exception("Error while flushing produced messages", exc_info=exc)
+            continue
+
+        if delivery_report.failed:
+            metrics.ingress_event_delivery_failure.inc(delivery_report.failed)
+            logger.error(
+                "Failed to deliver %s of %s %s produced for the batch",
+                delivery_report.failed,
+                delivery_report.queued,
+                description,
+            )
+
 
 def initialize_thread_local_storage(
     request_id: str | None, org_id: str | None = None, account_number: str | None = None
@@ -41,6 +41,14 @@ ingress_message_handler_failure = Counter(
 ingress_message_handler_time = Summary(
     "inventory_ingress_message_handler_seconds", "Total time spent handling messages from the ingress queue"
 )
+ingress_event_delivery_failure = Counter(
+    "inventory_ingress_event_delivery_failures",
+    "Total amount of events produced for an ingress batch that the broker failed to acknowledge",
+)
+ingress_event_batch_flush_time = Summary(
+    "inventory_ingress_event_batch_flush_seconds",
+    "Time spent waiting for delivery reports of all host events produced for an ingress batch",
+)
 consumed_message_size = Summary("inventory_consumed_message_size", "Size of incoming messages in bytes")
 produced_message_size = Summary("inventory_produced_message_size", "Size of outgoing messages in bytes")
 produce_large_message_failure = Counter(
@@ -253,7 +253,7 @@ def populate_events(base_notification_obj, host_list, extra_fields=None):
     return base_notification_obj
 
 
-def send_notification(notification_event_producer, notification_type, host, **kwargs):
+def send_notification(notification_event_producer, notification_type, host, *, wait=True, **kwargs):
     notification = build_notification(notification_type, host, **kwargs)
     headers = notification_headers(notification_type)
 
@@ -262,7 +262,11 @@ def send_notification(notification_event_producer, notification_type, host, **kw
         if headers[key] is None:
             del headers[key]
 
-    notification_event_producer.write_event(notification, None, headers, wait=True)
+    if wait:
+        notification_event_producer.write_event(notification, None, headers, wait=True)
+    else:
+        # The caller is responsible for calling notification_event_producer.flush_queued() afterwards
+        notification_event_producer.queue_event(notification, None, headers)
 
 
 NOTIFICATION_TYPE_MAP = {
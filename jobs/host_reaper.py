@@ -1,11 +1,14 @@
 #!/usr/bin/python3
 import sys
+import time
+from datetime import UTC
+from datetime import datetime
 from functools import partial
 
-from sqlalchemy import ColumnElement
-from sqlalchemy import and_
 from sqlalchemy import func
-from sqlalchemy import or_
+from sqlalchemy import literal
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
 
 from app.environment import RuntimeEnvironment
 from app.logging import get_logger
@@ -19,12 +22,12 @@ from jobs.common import excepthook
 from jobs.common import job_setup as host_reaper_job_setup
 from lib.feature_flags import FLAG_INVENTORY_API_READ_ONLY
 from lib.feature_flags import get_flag_value
-from lib.host_delete import delete_hosts
-from lib.host_repository import find_hosts_by_staleness_job
-from lib.host_repository import find_hosts_sys_default_staleness
+from lib.host_delete import delete_host_list
 from lib.metrics import delete_host_count
 from lib.metrics import delete_host_processing_time
+from lib.metrics import host_reaper_chunk_processing_time
 from lib.metrics import host_reaper_fail_count
+from lib.metrics import host_reaper_hosts_per_second
 
 PROMETHEUS_JOB = "inventory-reaper"
 LOGGER_NAME = "host_reaper"
@@ -32,6 +35,8 @@ COLLECTED_METRICS = (
     delete_host_count,
     delete_host_processing_time,
     host_reaper_fail_count,
+    host_reaper_chunk_processing_time,
+    host_reaper_hosts_per_second,
     event_producer_failure,
     event_producer_success,
     event_serialization_time,
@@ -39,79 +44,68 @@ COLLECTED_METRICS = (
 RUNTIME_ENVIRONMENT = RuntimeEnvironment.JOB
 
 
-def filter_hosts_in_state_using_custom_staleness(logger, session, state: list):
-    staleness_objects = session.query(Staleness).all()
-    org_ids = []
-
-    query_filters = []
-    for staleness_obj in staleness_objects:
-        # Validate which host types for a given org_id never get deleted
-        logger.debug(f"Looking for hosts from org_id {staleness_obj.org_id} that use custom staleness")
-        org_ids.append(staleness_obj.org_id)
-        query_filters.append(
-            and_(
-                (Host.org_id == staleness_obj.org_id),
-                find_hosts_by_staleness_job(state, staleness_obj.org_id),
-            )
+def find_culled_hosts_query(config, session) -> Query:
+    # Joins every host to its org's custom staleness, falling back to the system default when there is none,
+    # so the culled predicate stays a single condition no matter how many orgs use custom staleness.
+    time_to_delete = func.coalesce(Staleness.conventional_time_to_delete, config.conventional_time_to_delete_seconds)
+    culled_before = literal(datetime.now(UTC)) - func.make_interval(0, 0, 0, 0, 0, 0, time_to_delete)
+
+    # Exclude hosts that should stay fresh forever
+    return (
+        session.query(Host)
+        .outerjoin(Staleness, Staleness.org_id == Host.org_id)
+        .filter(
+            Host.last_check_in <= culled_before,
+            Host.per_reporter_staleness
+            != func.jsonb_build_object(
+                "rhsm-system-profile-bridge", Host.per_reporter_staleness["rhsm-system-profile-bridge"]
+            ),
         )
-    return query_filters, org_ids
-
-
-def filter_hosts_in_state_using_sys_default_staleness(logger, org_ids, state: list) -> ColumnElement:
-    # Use the hosts_ids_list to exclude hosts that were found with custom staleness
-    logger.debug("Looking for hosts that use system default staleness")
-    return and_(~Host.org_id.in_(org_ids), find_hosts_sys_default_staleness(state))
-
-
-def find_hosts_in_state(logger, session, state: list):
-    # Find all host ids that are using custom staleness
-    query_filters, org_ids = filter_hosts_in_state_using_custom_staleness(logger, session, state)
-
-    # Find all host ids that are not using custom staleness,
-    # excluding the hosts for the org_ids that use custom staleness
-    query_filters.append(filter_hosts_in_state_using_sys_default_staleness(logger, org_ids, state))
-
-    return query_filters
+    )
 
 
 @host_reaper_fail_count.count_exceptions()
 def run(config, logger, session, event_producer, notification_event_producer, shutdown_handler, application):
     with application.app.app_context():
-        filter_hosts_to_delete = find_hosts_in_state(logger, session, ["culled"])
-
-        # Apply the main filter and exclude hosts that should stay fresh forever
-        query = session.query(Host).filter(
-            and_(
-                or_(False, *filter_hosts_to_delete),
-                Host.per_reporter_staleness
-                != func.jsonb_build_object(
-                    "rhsm-system-profile-bridge", Host.per_reporter_staleness["rhsm-system-profile-bridge"]
-                ),
-            )
-        )
-
-        hosts_processed = config.host_delete_chunk_size
-        deletions_remaining = query.count()
-
-        logger.info(f"Found {deletions_remaining} hosts to potentially delete (excluding rhsm-only hosts)")
-
-        while hosts_processed == config.host_delete_chunk_size:
-            logger.info(f"Reaper starting batch; {deletions_remaining} remaining.")
+        query = find_culled_hosts_query(config, session)
+
+        start_time = time.perf_counter()
+        hosts_deleted = 0
+        last_key = None
+
+        # Page through the candidates by keyset on (org_id, id), so no chunk has to re-count or re-scan the hosts
+        # that were already deleted.
+        while True:
+            chunk_query = query
+            if last_key is not None:
+                chunk_query = chunk_query.filter(tuple_(Host.org_id, Host.id) > last_key)
+            hosts = chunk_query.order_by(Host.org_id, Host.id).limit(config.host_delete_chunk_size).all()
+            if not hosts:
+                break
+
+            last_key = (hosts[-1].org_id, hosts[-1].id)
+            logger.info(f"Reaper starting batch of {len(hosts)} hosts; {hosts_deleted} deleted so far.")
             try:
-                events = delete_hosts(
-                    query,
-                    event_producer,
-                    notification_event_producer,
-                    config.host_delete_chunk_size,
-                    shutdown_handler.shut_down,
-                    control_rule="REAPER",
-                )
-                hosts_processed = len(list(events))
+                with host_reaper_chunk_processing_time.time():
+                    events = delete_host_list(
+                        session,
+                        hosts,
+                        event_producer,
+                        notification_event_producer,
+                        shutdown_handler.shut_down,
+                        control_rule="REAPER",
+                    )
             except InterruptedError:
-                events = []
-                hosts_processed = 0
+                break
+
+            hosts_deleted += len(events)
+            if len(hosts) < config.host_delete_chunk_size:
+                break
 
-            deletions_remaining -= hosts_processed
+        elapsed = time.perf_counter() - start_time
+        if elapsed > 0:
+            host_reaper_hosts_per_second.set(hosts_deleted / elapsed)
+        logger.info(f"Reaper deleted {hosts_deleted} hosts in {elapsed:.2f} seconds.")
 
 
 if __name__ == "__main__":
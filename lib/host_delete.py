@@ -2,19 +2,25 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from collections.abc import Generator
+from collections.abc import Iterable
 from functools import partial
+from uuid import UUID
 
 from confluent_kafka import KafkaException
 from flask_sqlalchemy.query import Query
+from sqlalchemy import delete
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.auth.identity import Identity
 from app.auth.identity import to_auth_header
 from app.instrumentation import log_host_delete_succeeded
 from app.logging import get_logger
 from app.models import Host
+from app.models import HostDynamicSystemProfile
 from app.models import HostGroupAssoc
-from app.models import deleted_by_this_query
+from app.models import HostStaticSystemProfile
 from app.queue.event_producer import EventProducer
 from app.queue.events import EventType
 from app.queue.host_mq import OperationResult
@@ -25,31 +31,97 @@ from lib.db import session_guard
 from lib.host_kafka import kafka_available
 from lib.metrics import delete_host_count
 from lib.metrics import delete_host_processing_time
+from lib.outbox_repository import write_delete_events_to_outbox
 from utils.system_profile_log import extract_host_model_sp_to_log
 
-__all__ = ("delete_hosts",)
+__all__ = ("delete_hosts", "delete_host_list")
 logger = get_logger(__name__)
 
 
 def _delete_host_db_records(
-    select_query: Query,
-    chunk_size: int,
+    session: Session,
+    hosts: Iterable[Host],
     identity: Identity | None,
     interrupt: Callable[[], bool],
     control_rule: str | None,
 ) -> list[OperationResult]:
-    results_list = []
-
-    for host in select_query.limit(chunk_size):
-        with delete_host_processing_time.time():
-            result = _delete_host(select_query.session, host, identity, control_rule)
-        if deleted_by_this_query(result.row):
-            results_list.append(result)
+    hosts = list(hosts)
+    if not hosts:
+        return []
+
+    with delete_host_processing_time.time():
+        # The delete events are built from these objects after their rows are gone,
+        # so everything they need has to be loaded beforehand.
+        _load_system_profiles(session, hosts)
+        sp_fields_to_log = {host.id: extract_host_model_sp_to_log(host) for host in hosts}
+        deleted_ids = _bulk_delete_hosts(session, hosts)
+
+    if interrupt():
+        raise InterruptedError()
+
+    deleted_hosts = [host for host in hosts if host.id in deleted_ids]
+    write_delete_events_to_outbox([str(host.id) for host in deleted_hosts], session=session)
+
+    return [
+        OperationResult(
+            host,
+            {"b64_identity": to_auth_header(identity)} if identity else None,
+            None,
+            None,
+            EventType.delete,
+            partial(log_host_delete_succeeded, logger, host.id, control_rule, sp_fields_to_log[host.id]),
+        )
+        for host in deleted_hosts
+    ]
+
+
+def _load_system_profiles(session: Session, hosts: list[Host]) -> None:
+    host_keys = [(host.org_id, host.id) for host in hosts]
+    static_profiles = {
+        (profile.org_id, profile.host_id): profile
+        for profile in session.query(HostStaticSystemProfile).filter(
+            tuple_(HostStaticSystemProfile.org_id, HostStaticSystemProfile.host_id).in_(host_keys)
+        )
+    }
+    dynamic_profiles = {
+        (profile.org_id, profile.host_id): profile
+        for profile in session.query(HostDynamicSystemProfile).filter(
+            tuple_(HostDynamicSystemProfile.org_id, HostDynamicSystemProfile.host_id).in_(host_keys)
+        )
+    }
+    for host in hosts:
+        host_key = (host.org_id, host.id)
+        set_committed_value(host, "static_system_profile", static_profiles.get(host_key))
+        set_committed_value(host, "dynamic_system_profile", dynamic_profiles.get(host_key))
+
+
+def _bulk_delete_hosts(session: Session, hosts: list[Host]) -> set[UUID]:
+    host_keys = [(host.org_id, host.id) for host in hosts]
+    session.execute(
+        delete(HostGroupAssoc)
+        .where(tuple_(HostGroupAssoc.org_id, HostGroupAssoc.host_id).in_(host_keys))
+        .execution_options(synchronize_session="fetch")
+    )
+    deleted_ids = set(
+        session.execute(
+            delete(Host)
+            .where(tuple_(Host.org_id, Host.id).in_(host_keys))
+            .returning(Host.id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
 
-        if interrupt():
-            raise InterruptedError()
+    # Detach the deleted hosts (and their profiles, removed by the database cascade) with their
+    # attributes still loaded, the same way a flushed session.delete() would leave them.
+    for host in hosts:
+        if host.id not in deleted_ids:
+            continue
+        for profile in (host.static_system_profile, host.dynamic_system_profile):
+            if profile is not None and profile in session:
+                session.expunge(profile)
+        session.expunge(host)
 
-    return results_list
+    return deleted_ids
 
 
 def _send_delete_messages_for_batch(
@@ -58,11 +130,24 @@ def _send_delete_messages_for_batch(
     notification_event_producer: EventProducer,
     initiated_by_frontend: bool,
 ) -> None:
+    # The events of the whole chunk are queued and flushed once, before the chunk's transaction is committed
     for result in processed_rows:
         if result is not None:
             delete_host_count.inc()
-            write_delete_event_message(event_producer, result, initiated_by_frontend)
-            send_notification(notification_event_producer, NotificationType.system_deleted, vars(result.row))
+            write_delete_event_message(event_producer, result, initiated_by_frontend, wait=False)
+            send_notification(
+                notification_event_producer, NotificationType.system_deleted, vars(result.row), wait=False
+            )
+
+    for producer, description in ((event_producer, "delete events"), (notification_event_producer, "notifications")):
+        delivery_report = producer.flush_queued()
+        if delivery_report.failed:
+            logger.error(
+                "Failed to deliver %s of %s %s produced for the deleted hosts",
+                delivery_report.failed,
+                delivery_report.queued,
+                description,
+            )
 
 
 def delete_hosts(
@@ -79,7 +164,9 @@ def delete_hosts(
     while select_query.count():
         if kafka_available():
             with session_guard(select_query.session):
-                batch_events = _delete_host_db_records(select_query, chunk_size, identity, interrupt, control_rule)
+                batch_events = _delete_host_db_records(
+                    select_query.session, select_query.limit(chunk_size), identity, interrupt, control_rule
+                )
                 _send_delete_messages_for_batch(
                     batch_events, event_producer, notification_event_producer, initiated_by_frontend
                 )
@@ -92,25 +179,28 @@ def delete_hosts(
             raise KafkaException("Kafka server not available. Stopping host deletions.")
 
 
-def _delete_host(session: Session, host: Host, identity: Identity | None, control_rule: str | None) -> OperationResult:
-    sp_fields_to_log = extract_host_model_sp_to_log(host)
-    org_id = identity.org_id if identity else host.org_id
-    assoc_delete_query = session.query(HostGroupAssoc).filter(
-        HostGroupAssoc.org_id == org_id, HostGroupAssoc.host_id == host.id
-    )
-    assoc_delete_query.delete(synchronize_session="fetch")
-
-    # Use ORM delete instead of bulk delete so SQLAlchemy events fire
-    # This allows automatic outbox entry creation via event listener
-    # See lib/host_outbox_events.py
-    session.delete(host)
-    session.flush()
-
-    return OperationResult(
-        host,
-        {"b64_identity": to_auth_header(identity)} if identity else None,
-        None,
-        None,
-        EventType.delete,
-        partial(log_host_delete_succeeded, logger, host.id, control_rule, sp_fields_to_log),
-    )
+def delete_host_list(
+    session: Session,
+    hosts: list[Host],
+    event_producer: EventProducer,
+    notification_event_producer: EventProducer,
+    interrupt: Callable[[], bool] = lambda: False,
+    identity: Identity | None = None,
+    control_rule: str | None = None,
+    initiated_by_frontend: bool = False,
+) -> list[OperationResult]:
+    """
+    Deletes an already selected chunk of hosts in one transaction and produces their events.
+    Unlike delete_hosts, it never re-runs a query, so the caller decides how the chunks are paged.
+    """
+    if not kafka_available():
+        logger.error("Host batch not deleted because Kafka server not available.")
+        raise KafkaException("Kafka server not available. Stopping host deletions.")
+
+    with session_guard(session):
+        batch_events = _delete_host_db_records(session, hosts, identity, interrupt, control_rule)
+        _send_delete_messages_for_batch(
+            batch_events, event_producer, notification_event_producer, initiated_by_frontend
+        )
+
+    return batch_events
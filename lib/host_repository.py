@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Callable
+from collections.abc import Iterator
 from enum import Enum
 from typing import Any
+from uuid import UUID
 
 from flask import current_app
 from flask_sqlalchemy.query import Query
@@ -13,8 +16,6 @@ from sqlalchemy.sql.elements import BinaryExpression
 from sqlalchemy.sql.elements import BooleanClauseList
 
 from api.filtering.db_filters import find_stale_host_in_window
-from api.filtering.db_filters import stale_timestamp_filter
-from api.filtering.db_filters import staleness_to_conditions
 from api.filtering.db_filters import update_query_for_owner_id
 from api.staleness_query import get_staleness_obj
 from app.auth.identity import Identity
@@ -32,12 +33,14 @@ from app.models import LimitedHost
 from app.models import db
 from app.serialization import serialize_canonical_facts
 from app.serialization import serialize_staleness_to_dict
+from app.serialization import serialize_uuid
 from app.staleness_serialization import get_sys_default_staleness
 from app.staleness_states import HostStalenessStatesDbFilters
 from lib import metrics
 
 __all__ = (
     "AddHostResult",
+    "HostDedupIndex",
     "extract_immutable_and_id_facts",
     "add_host",
     "multiple_canonical_facts_host_query",
@@ -59,6 +62,7 @@ def add_host(
     update_system_profile: bool = True,
     operation_args: dict | None = None,
     existing_hosts: list[Host] | None = None,
+    dedup_index: HostDedupIndex | None = None,
 ) -> tuple[Host, AddHostResult]:
     """
     Add or update a host
@@ -70,6 +74,9 @@ def add_host(
      The only supported argument in the operation_args for now is "defer_to_reporter".
      It is documented here:
      https://inscope.corp.redhat.com/docs/default/Component/consoledot-pages/services/inventory/#expected-message-format
+
+    When a dedup_index prefetched for the whole MQ batch covers all ID facts of the host,
+    the existing host is resolved from it without querying the DB.
     """
     # Import here to avoid circular import
     from lib.group_repository import get_or_create_ungrouped_hosts_group_for_identity
@@ -80,12 +87,15 @@ def add_host(
 
     matched_host = None
     canonical_facts = serialize_canonical_facts(input_host, include_none=False)
-    if existing_hosts:
-        # First, try to match the host in memory - from the provided list of existing hosts
-        matched_host = find_existing_host(identity, canonical_facts, existing_hosts)
-    if matched_host is None:
-        # If the list of existing hosts was not provided, or the match was not found, try querying DB
-        matched_host = find_existing_host(identity, canonical_facts)
+    if dedup_index is not None and dedup_index.covers(identity, canonical_facts):
+        matched_host = dedup_index.find_existing_host(identity, canonical_facts)
+    else:
+        if existing_hosts:
+            # First, try to match the host in memory - from the provided list of existing hosts
+            matched_host = find_existing_host(identity, canonical_facts, existing_hosts)
+        if matched_host is None:
+            # If the list of existing hosts was not provided, or the match was not found, try querying DB
+            matched_host = find_existing_host(identity, canonical_facts)
 
     group = get_or_create_ungrouped_hosts_group_for_identity(identity)
     input_host.groups = [serialize_group(group)]
@@ -98,13 +108,19 @@ def add_host(
                 logger.debug("host_repository.add_host: setting update_system_profile = False")
                 update_system_profile = False
 
-        return update_existing_host(matched_host, input_host, update_system_profile)
+        host_row, add_result = update_existing_host(matched_host, input_host, update_system_profile)
     else:
         # create a new host group association for the host
         assoc = HostGroupAssoc(input_host.id, group.id, identity.org_id)
         db.session.add(assoc)
 
-        return create_new_host(input_host)
+        host_row, add_result = create_new_host(input_host)
+
+    if dedup_index is not None:
+        # Later hosts from the same batch have to be deduplicated against this one as well
+        dedup_index.add(host_row)
+
+    return host_row, add_result
 
 
 def extract_immutable_and_id_facts(canonical_facts: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
@@ -141,15 +157,24 @@ def find_existing_host(
     identity: Identity, canonical_facts: dict[str, Any], from_hosts: list[Host] | None = None
 ) -> Host | None:
     logger.debug(f"find_existing_host({identity}, {canonical_facts}, {from_hosts})")
-    immutable_facts, id_facts = extract_immutable_and_id_facts(canonical_facts)
 
-    # First search based on immutable id facts.
-    if immutable_facts:  # noqa: SIM102
-        if existing_host := _find_host_by_multiple_facts_in_db_or_in_memory(identity, immutable_facts, from_hosts):
+    for target_facts in _dedup_target_facts(canonical_facts):
+        if existing_host := _find_host_by_multiple_facts_in_db_or_in_memory(identity, target_facts, from_hosts):
             return existing_host
 
-    if not id_facts:
-        return None
+    return None
+
+
+def _dedup_target_facts(canonical_facts: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    Yields the sets of facts to search for, in the order in which they have to be tried:
+    first the immutable ID facts, then each of the other ID facts in the priority order.
+    """
+    immutable_facts, id_facts = extract_immutable_and_id_facts(canonical_facts)
+
+    # First search based on immutable id facts.
+    if immutable_facts:
+        yield immutable_facts
 
     # Now search based on other ID facts
     # Dicts have been ordered since Python 3.7, so the priority ordering will be respected
@@ -162,10 +187,128 @@ def find_existing_host(
             if compound_fact_value := canonical_facts.get(compound_fact):
                 target_facts[compound_fact] = compound_fact_value
 
-        if existing_host := _find_host_by_multiple_facts_in_db_or_in_memory(identity, target_facts, from_hosts):
-            return existing_host
+        yield target_facts
+
+
+def _dedup_key(key: str, value: Any) -> Any:
+    # insights_id is stored as a UUID, so it has to be compared in its canonical string form
+    if key == "insights_id":
+        try:
+            return serialize_uuid(value if isinstance(value, UUID) else UUID(str(value)))
+        except ValueError:
+            return None
+    return value
+
+
+class _HostFactIndex:
+    """Hosts indexed by the values of their ID facts, each host ranked by its matching priority."""
+
+    def __init__(self) -> None:
+        self._hosts_by_fact: dict[str, dict[Any, list[Host]]] = defaultdict(lambda: defaultdict(list))
+        self._ranks: dict[int, Any] = {}
+
+    def add(self, host: Host, rank: Any) -> None:
+        self._ranks.setdefault(id(host), rank)
+        for key in (*ID_FACTS, *COMPOUND_ID_FACTS):
+            value = _dedup_key(key, getattr(host, key, None))
+            if value is None:
+                continue
+            hosts = self._hosts_by_fact[key][value]
+            if not any(indexed_host is host for indexed_host in hosts):
+                hosts.append(host)
+
+    def find(self, identity: Identity, target_facts: dict[str, Any]) -> Host | None:
+        expected_facts = {key: _dedup_key(key, value) for key, value in target_facts.items()}
+        candidates = {
+            id(host): host
+            for key, value in expected_facts.items()
+            # The second component of compound facts is only used to rule out candidates
+            if key not in COMPOUND_ID_FACTS
+            for host in self._hosts_by_fact[key].get(value, ())
+        }
+
+        # The indexed values may be outdated if the host was updated after it was indexed,
+        # so the candidates are always checked against their current values.
+        matches = [
+            host
+            for host in candidates.values()
+            if host.org_id == identity.org_id
+            and all(
+                (host_value := _dedup_key(key, getattr(host, key, None))) is None or host_value == value
+                for key, value in expected_facts.items()
+            )
+            and any(
+                _dedup_key(key, getattr(host, key, None)) == value
+                for key, value in expected_facts.items()
+                if key not in COMPOUND_ID_FACTS
+            )
+        ]
+        return min(matches, key=lambda host: self._ranks[id(host)]) if matches else None
 
-    return None
+
+class HostDedupIndex:
+    """
+    Deduplication lookup for all hosts of a single MQ batch.
+
+    The existing hosts that could match any host in the batch are loaded upfront with a single
+    query per org, and indexed by each of their ID facts. Hosts added or updated while the batch
+    is processed are indexed as well, and take precedence over the prefetched ones, same as the
+    list of existing hosts passed to add_host().
+    """
+
+    def __init__(self) -> None:
+        self._prefetched_facts: set[tuple[str, str, Any]] = set()
+        self._db_hosts = _HostFactIndex()
+        self._batch_hosts = _HostFactIndex()
+        self._batch_size = 0
+
+    def prefetch(self, org_id: str, canonical_facts_list: list[dict[str, Any]]) -> None:
+        """Load all non-culled hosts of the org matching at least one of the ID facts in canonical_facts_list."""
+        values_by_fact: dict[str, set[Any]] = defaultdict(set)
+        for canonical_facts in canonical_facts_list:
+            for key in ID_FACTS:
+                # The facts are not validated yet, so anything that can't be a valid value is skipped
+                if isinstance(value := _dedup_key(key, canonical_facts.get(key)), str):
+                    values_by_fact[key].add(value)
+
+        if not values_by_fact:
+            return
+
+        with metrics.prefetch_hosts_for_dedup.time():
+            query = host_query(org_id).filter(
+                or_(*(getattr(Host, key).in_(values) for key, values in values_by_fact.items()))
+            )
+            for host in find_non_culled_hosts(query).all():
+                # Newest hosts take precedence, same as in find_existing_host()
+                self._db_hosts.add(host, -host.modified_on.timestamp())
+
+        self._prefetched_facts.update(
+            (org_id, key, value) for key, values in values_by_fact.items() for value in values
+        )
+
+    def add(self, host: Host) -> None:
+        self._batch_hosts.add(host, self._batch_size)
+        self._batch_size += 1
+
+    def covers(self, identity: Identity, canonical_facts: dict[str, Any]) -> bool:
+        """Whether all existing hosts that could match canonical_facts have been prefetched."""
+        immutable_facts, id_facts = extract_immutable_and_id_facts(canonical_facts)
+        return all(
+            (identity.org_id, key, _dedup_key(key, value)) in self._prefetched_facts
+            for key, value in {**immutable_facts, **id_facts}.items()
+            if key not in COMPOUND_ID_FACTS
+        )
+
+    @metrics.host_dedup_processing_time.time()
+    def find_existing_host(self, identity: Identity, canonical_facts: dict[str, Any]) -> Host | None:
+        with metrics.find_host_by_facts_in_memory.time():
+            # Hosts from the current batch are searched first, then the ones prefetched from the DB
+            for index in (self._batch_hosts, self._db_hosts):
+                for target_facts in _dedup_target_facts(canonical_facts):
+                    if existing_host := index.find(identity, target_facts):
+                        return existing_host
+
+        return None
 
 
 def find_existing_host_by_id(identity: Identity, host_id: str) -> Host | None:
@@ -235,14 +378,6 @@ def multiple_canonical_facts_host_query_in_memory(
     return _query
 
 
-def find_hosts_by_staleness_job(staleness_types, org_id):
-    logger.debug("find_hosts_by_staleness(%s)", staleness_types)
-    staleness_obj = serialize_staleness_to_dict(get_staleness_obj(org_id))
-    staleness_conditions = staleness_to_conditions(staleness_obj, staleness_types, stale_timestamp_filter)
-
-    return or_(False, *staleness_conditions)
-
-
 def find_stale_hosts(org_id, last_run_secs, job_start_time):
     logger.debug("finding stale hosts with custom staleness")
     staleness_obj = serialize_staleness_to_dict(get_staleness_obj(org_id))
@@ -259,14 +394,6 @@ def find_stale_host_sys_default_staleness(last_run_secs, job_start_time):
     return or_(False, *staleness_conditions)
 
 
-def find_hosts_sys_default_staleness(staleness_types):
-    logger.debug("find hosts with system default staleness")
-    sys_default_staleness = serialize_staleness_to_dict(get_sys_default_staleness())
-    staleness_conditions = staleness_to_conditions(sys_default_staleness, staleness_types, stale_timestamp_filter)
-
-    return or_(False, *staleness_conditions)
-
-
 def find_non_culled_hosts(query: Query) -> Query:
     host_staleness_states_filters = HostStalenessStatesDbFilters()
     return query.filter(not_(host_staleness_states_filters.culled()))
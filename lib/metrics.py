@@ -1,4 +1,5 @@
 from prometheus_client import Counter
+from prometheus_client import Gauge
 from prometheus_client import Summary
 
 host_dedup_processing_time = Summary(
@@ -12,6 +13,10 @@ find_host_by_facts_in_memory = Summary(
     "inventory_find_host_by_facts_in_memory_processing_seconds",
     "Time spent looking for existing host by canonical facts in memory (during MQ batch processing)",
 )
+prefetch_hosts_for_dedup = Summary(
+    "inventory_prefetch_hosts_for_dedup_processing_seconds",
+    "Time spent loading the existing hosts matching the ID facts of a whole MQ batch (dedup logic)",
+)
 new_host_commit_processing_time = Summary(
     "inventory_new_host_commit_seconds", "Time spent committing a new host to the database"
 )
@@ -25,6 +30,12 @@ delete_host_processing_time = Summary(
     "inventory_delete_host_commit_seconds", "Time spent deleting hosts from the database"
 )
 host_reaper_fail_count = Counter("inventory_reaper_fail_count", "The total amount of Host Reaper failures.")
+host_reaper_chunk_processing_time = Summary(
+    "inventory_reaper_chunk_seconds", "Time spent deleting one chunk of culled hosts in the Host Reaper"
+)
+host_reaper_hosts_per_second = Gauge(
+    "inventory_reaper_hosts_per_second", "The amount of hosts deleted per second during the last Host Reaper run"
+)
 
 # Inventory Groups
 create_group_count = Counter("inventory_create_group_count", "The total amount of groups created")
@@ -2,6 +2,8 @@ import json
 import uuid
 
 from marshmallow import ValidationError
+from sqlalchemy import delete
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -189,3 +191,39 @@ def write_event_to_outbox(
 
         # Re-raise the exception so caller can handle rollback
         raise OutboxSaveException("Failed to save event to outbox") from db_error
+
+
+def write_delete_events_to_outbox(host_ids: list[str], session: Session | None = None) -> None:
+    """
+    Bulk version of write_event_to_outbox for 'delete' events: all entries are
+    inserted and removed again with one statement each, in the caller's transaction.
+    """
+    if not host_ids:
+        return
+
+    outbox_session = session if session is not None else db.session
+
+    try:
+        outbox_entries = OutboxSchema(many=True).load(
+            [_build_outbox_entry(EventType.delete, host_id) for host_id in host_ids]
+        )
+    except ValidationError as ve:
+        raise OutboxSaveException("Invalid host or event was provided") from ve
+
+    logger.debug("Creating %s 'delete' outbox entries", len(outbox_entries))
+    try:
+        outbox_ids = [uuid.uuid4() for _ in outbox_entries]
+        outbox_session.execute(
+            insert(Outbox),
+            [
+                {"id": outbox_id, **outbox_entry}
+                for outbox_id, outbox_entry in zip(outbox_ids, outbox_entries, strict=True)
+            ],
+        )
+        outbox_session.execute(delete(Outbox).where(Outbox.id.in_(outbox_ids)))
+
+        outbox_save_success.inc(len(outbox_entries))
+    except SQLAlchemyError as db_error:
+        logger.error("Database error while adding to outbox: %s", str(db_error))
+        outbox_save_failure.inc(len(outbox_entries))
+        raise OutboxSaveException("Failed to save event to outbox") from db_error
@@ -1,3 +1,5 @@
+from api.staleness_query import invalidate_staleness_cache
+from api.staleness_query import notify_staleness_changed
 from app.auth import get_current_identity
 from app.logging import get_logger
 from app.models import Staleness
@@ -23,6 +25,9 @@ def add_staleness(staleness_data) -> Staleness:
         )
         db.session.add(new_staleness)
         db.session.flush()
+        notify_staleness_changed(org_id)
+
+    invalidate_staleness_cache(org_id)
 
     # gets the Staleness object after it has been committed
     created_staleness = Staleness.query.filter(Staleness.org_id == org_id).one_or_none()
@@ -37,7 +42,9 @@ def patch_staleness(staleness_data) -> Staleness:
     updated_data = {key: value for (key, value) in staleness_data.items() if value}
 
     Staleness.query.filter(Staleness.org_id == org_id).update(updated_data)
+    notify_staleness_changed(org_id)
     db.session.commit()
+    invalidate_staleness_cache(org_id)
 
     updated_staleness = Staleness.query.filter(Staleness.org_id == org_id).one_or_none()
 
@@ -50,4 +57,6 @@ def remove_staleness() -> None:
     logger.debug("Removing AccountStaleness for org_id: %s", org_id)
     staleness = Staleness.query.filter(Staleness.org_id == org_id).one()
     db.session.delete(staleness)
+    notify_staleness_changed(org_id)
     db.session.commit()
+    invalidate_staleness_cache(org_id)
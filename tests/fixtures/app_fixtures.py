@@ -7,6 +7,8 @@ import pytest
 from connexion import FlaskApp
 from sqlalchemy import text as sa_text
 
+from api.staleness_query import close_staleness_change_listener
+from api.staleness_query import invalidate_staleness_cache
 from app import create_app
 from app.config import Config
 from app.environment import RuntimeEnvironment
@@ -24,6 +26,7 @@ def new_flask_app(database: str) -> Generator[FlaskApp]:  # noqa: ARG001
 
         yield application
 
+        close_staleness_change_listener()
         db.session.remove()
         db.drop_all()
         db.engine.dispose()
@@ -37,6 +40,7 @@ def flask_app(new_flask_app: FlaskApp) -> Generator[FlaskApp]:
 
     new_flask_app.app.config = original_app_config
     clean_tables()
+    invalidate_staleness_cache()
 
 
 @pytest.fixture(scope="function")
@@ -13,6 +13,7 @@ from sqlalchemy_utils import create_database
 from sqlalchemy_utils import database_exists
 from sqlalchemy_utils import drop_database
 
+from api.staleness_query import invalidate_staleness_cache
 from app.config import Config
 from app.environment import RuntimeEnvironment
 from app.models import Group
@@ -317,6 +318,7 @@ def db_create_staleness_culling(flask_app):  # noqa: ARG001
         )
         db.session.add(staleness_culling)
         db.session.commit()
+        invalidate_staleness_cache(staleness_culling.org_id)
         return staleness_culling
 
     return _db_create_staleness_culling
@@ -328,6 +330,7 @@ def db_delete_staleness_culling(flask_app):  # noqa: ARG001
         delete_query = db.session.query(Staleness).filter(Staleness.org_id == org_id)
         delete_query.delete(synchronize_session="fetch")
         delete_query.session.commit()
+        invalidate_staleness_cache(org_id)
 
     return _db_delete_staleness_culling
 
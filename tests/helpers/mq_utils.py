@@ -18,6 +18,7 @@ from app.culling import CONVENTIONAL_TIME_TO_DELETE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_WARNING_SECONDS
 from app.models import Host
+from app.queue.event_producer import DeliveryReport
 from app.serialization import _deserialize_tags
 from app.serialization import serialize_facts
 from app.serialization import serialize_uuid
@@ -46,6 +47,12 @@ class MockEventProducer:
         self.headers = headers
         self.wait = wait
 
+    def queue_event(self, event, key, headers):
+        self.write_event(event, key, headers)
+
+    def flush_queued(self, timeout=None):  # noqa: ARG002
+        return DeliveryReport()
+
 
 class FakeMessage:
     def __init__(self, error=None, message=None, headers=None):
@@ -11,12 +11,18 @@ from unittest.mock import patch
 
 import pytest
 from confluent_kafka import KafkaException
+from sqlalchemy import delete
 
 from app.culling import CONVENTIONAL_TIME_TO_STALE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_WARNING_SECONDS
+from app.logging import threadctx
 from app.models import Host
+from app.models import db
+from app.queue.event_producer import DeliveryReport
 from app.queue.event_producer import MessageDetails
 from app.queue.event_producer import logger as event_producer_logger
+from lib import host_delete
+from lib.host_delete import delete_host_list
 from lib.host_delete import delete_hosts
 from lib.host_repository import get_host_list_by_id_list_from_db
 from tests.helpers.api_utils import HOST_WRITE_ALLOWED_RBAC_RESPONSE_FILES
@@ -582,8 +588,8 @@ def test_delete_host_that_belongs_to_group_fail(
     assert len(hosts_before) == 3
 
     # Patch it so the DB deletion fails
-    deleted_by_this_query_mock = mocker.patch("lib.host_delete.deleted_by_this_query")
-    deleted_by_this_query_mock.side_effect = InterruptedError()
+    write_outbox_mock = mocker.patch("lib.host_delete.write_delete_events_to_outbox")
+    write_outbox_mock.side_effect = InterruptedError()
 
     # Delete the first host
     api_delete_host(host_id_list[0])
@@ -1034,3 +1040,65 @@ def test_delete_hosts_filtered_default_staleness(
     # Verify that all hosts were deleted
     for host_id in host_ids:
         assert not db_get_host(host_id), f"Host {host_id} should have been deleted"
+
+
+def test_delete_host_list_skips_hosts_deleted_concurrently(flask_app, db_create_multiple_hosts, mocker):
+    threadctx.request_id = None
+    with flask_app.app.app_context():
+        hosts = db_create_multiple_hosts(how_many=3)
+        host_ids = [host.id for host in hosts]
+        selected_hosts = Host.query.filter(Host.id.in_(host_ids)).all()
+
+        # Another process deletes one of the selected hosts before this chunk is deleted
+        with db.engine.begin() as connection:
+            connection.execute(delete(Host).where(Host.id == host_ids[0]))
+
+        event_producer = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+        notification_event_producer = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+        mocker.patch("lib.host_delete.kafka_available", return_value=True)
+        write_outbox_spy = mocker.spy(host_delete, "write_delete_events_to_outbox")
+
+        results = delete_host_list(db.session, selected_hosts, event_producer, notification_event_producer)
+
+        assert {result.row.id for result in results} == set(host_ids[1:])
+        assert sorted(write_outbox_spy.call_args.args[0]) == sorted(str(host_id) for host_id in host_ids[1:])
+        assert {call.args[1] for call in event_producer.queue_event.call_args_list} == {
+            str(host_id) for host_id in host_ids[1:]
+        }
+        assert notification_event_producer.queue_event.call_count == 2
+
+        # Each producer waits for the broker once for the whole chunk
+        event_producer.write_event.assert_not_called()
+        event_producer.flush_queued.assert_called_once()
+        notification_event_producer.write_event.assert_not_called()
+        notification_event_producer.flush_queued.assert_called_once()
+
+
+def test_delete_host_list_events_keep_system_profile(flask_app, db_create_host, mocker):
+    threadctx.request_id = None
+    with flask_app.app.app_context():
+        host = db_create_host(
+            extra_data={
+                "system_profile_facts": {
+                    "owner_id": SYSTEM_IDENTITY["system"]["cn"],
+                    "host_type": "edge",
+                    "operating_system": {"major": 9, "minor": 4, "name": "RHEL"},
+                }
+            }
+        )
+        selected_hosts = Host.query.filter(Host.id == host.id).all()
+        event_producer = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+        notification_event_producer = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+        mocker.patch("lib.host_delete.kafka_available", return_value=True)
+
+        results = delete_host_list(db.session, selected_hosts, event_producer, notification_event_producer)
+
+        headers = event_producer.queue_event.call_args.args[2]
+        assert headers["host_type"] == "edge"
+        assert headers["os_name"] == "RHEL"
+
+        # The deleted host is detached with its system profile still loaded
+        deleted_host = results[0].row
+        assert deleted_host not in db.session
+        assert str(deleted_host.static_system_profile.owner_id) == SYSTEM_IDENTITY["system"]["cn"]
+        assert not Host.query.filter(Host.id == host.id).count()
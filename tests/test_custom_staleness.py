@@ -1,14 +1,23 @@
 from datetime import timedelta
+from threading import Thread
+from time import sleep
 from unittest.mock import patch
 
 import pytest
 
+from api.staleness_query import StalenessCache
+from api.staleness_query import _StalenessChangeListener
+from api.staleness_query import get_staleness_obj
+from api.staleness_query import notify_staleness_changed
 from app.culling import CONVENTIONAL_TIME_TO_DELETE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_WARNING_SECONDS
+from app.models import db
 from tests.helpers.api_utils import build_hosts_url
 from tests.helpers.api_utils import build_staleness_url
+from tests.helpers.db_utils import db_staleness_culling
 from tests.helpers.outbox_utils import wait_for_all_events
+from tests.helpers.test_utils import USER_IDENTITY
 from tests.helpers.test_utils import now
 
 CUSTOM_STALENESS_DELETE = {
@@ -347,3 +356,75 @@ def test_registered_with_filter_handles_multi_reporter_hosts(
             # The equation should hold
             assert puptoo_count + not_puptoo_count == total_hosts
             assert yupana_count + not_yupana_count == total_hosts
+
+
+def test_staleness_cache_invalidated_by_api_update(flask_app, api_patch, db_create_staleness_culling):
+    with flask_app.app.app_context():
+        db_create_staleness_culling(conventional_time_to_stale=1)
+        assert get_staleness_obj(USER_IDENTITY["org_id"])["conventional_time_to_stale"] == 1
+
+        response_status, _ = api_patch(build_staleness_url(), host_data={"conventional_time_to_stale": 99})
+        assert response_status == 200
+
+        assert get_staleness_obj(USER_IDENTITY["org_id"])["conventional_time_to_stale"] == 99
+
+
+def test_staleness_cache_invalidated_by_notification(flask_app):
+    org_id = USER_IDENTITY["org_id"]
+    with flask_app.app.app_context():
+        assert get_staleness_obj(org_id)["id"] == "system_default"
+
+        # Simulates another process changing the staleness: the row is written without touching this cache
+        db.session.add(db_staleness_culling(conventional_time_to_stale=1))
+        db.session.commit()
+        assert get_staleness_obj(org_id)["id"] == "system_default"
+
+        notify_staleness_changed(org_id)
+        db.session.commit()
+        for _ in range(50):
+            if get_staleness_obj(org_id)["id"] != "system_default":
+                break
+            sleep(0.1)
+
+        assert get_staleness_obj(org_id)["conventional_time_to_stale"] == 1
+
+
+def test_staleness_cache_evicts_least_recently_used_and_expired(mocker):
+    monotonic = mocker.patch("api.staleness_query.time.monotonic", return_value=0)
+    cache = StalenessCache(max_size=2, ttl=10)
+
+    cache.set("org1", "staleness1")
+    cache.set("org2", "staleness2")
+    assert cache.get("org1") == "staleness1"
+    cache.set("org3", "staleness3")
+    assert cache.get("org2") is None
+
+    monotonic.return_value = 10
+    assert cache.get("org1") is None
+    assert cache.get("org3") is None
+
+
+def test_staleness_change_listener_connects_once_across_threads(mocker, flask_app):
+    conn = mocker.MagicMock(closed=False, notifies=[])
+
+    def slow_connect(*_):
+        sleep(0.1)
+        return conn
+
+    connect = mocker.patch("api.staleness_query.psycopg2.connect", side_effect=slow_connect)
+    listener = _StalenessChangeListener()
+    cache = StalenessCache(max_size=2, ttl=10)
+
+    def drain():
+        with flask_app.app.app_context():
+            listener.drain(cache)
+
+    threads = [Thread(target=drain) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # The other threads waited for the connection instead of racing it
+    connect.assert_called_once()
+    assert conn.poll.call_count == 4
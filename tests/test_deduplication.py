@@ -16,12 +16,14 @@ from app.models import Host
 from app.models import ProviderType
 from app.models.constants import FAR_FUTURE_STALE_TIMESTAMP
 from app.utils import HostWrapper
+from lib.host_repository import HostDedupIndex
 from lib.host_repository import find_existing_host
 from tests.helpers.db_utils import assert_host_exists_in_db
 from tests.helpers.db_utils import assert_host_missing_from_db
 from tests.helpers.db_utils import db_host
 from tests.helpers.db_utils import minimal_db_host
 from tests.helpers.test_utils import SYSTEM_IDENTITY
+from tests.helpers.test_utils import USER_IDENTITY
 from tests.helpers.test_utils import base_host
 from tests.helpers.test_utils import generate_all_canonical_facts
 from tests.helpers.test_utils import generate_fact
@@ -541,3 +543,88 @@ def test_deduplication_culled_host(
     updated_host = mq_create_or_update_host(minimal_host(**canonical_facts, reporter="puptoo"))
     assert str(updated_host.id) != str(created_host.id)
     assert_host_exists_in_db(updated_host.id, canonical_facts)
+
+
+def test_dedup_index_matches_like_find_existing_host(db_create_host: Callable[..., Host]):
+    """The batch dedup index resolves the same host as the DB queries, respecting the ID facts priority."""
+    identity = Identity(SYSTEM_IDENTITY)
+    subman_host = db_create_host(host=minimal_db_host(subscription_manager_id=generate_uuid()))
+    insights_host = db_create_host(host=minimal_db_host(insights_id=generate_uuid()))
+
+    canonical_facts = {
+        "subscription_manager_id": subman_host.subscription_manager_id,
+        "insights_id": str(insights_host.insights_id),
+    }
+    dedup_index = HostDedupIndex()
+    dedup_index.prefetch(identity.org_id, [canonical_facts])
+
+    assert dedup_index.covers(identity, canonical_facts)
+    assert dedup_index.find_existing_host(identity, canonical_facts) is subman_host
+    assert find_existing_host(identity, canonical_facts) is subman_host
+
+
+def test_dedup_index_immutable_fact_mismatch(db_create_host: Callable[..., Host]):
+    identity = Identity(SYSTEM_IDENTITY)
+    insights_id = generate_uuid()
+    db_create_host(
+        host=minimal_db_host(
+            insights_id=insights_id, provider_id=generate_uuid(), provider_type=ProviderType.AWS.value
+        )
+    )
+
+    canonical_facts = {
+        "insights_id": insights_id,
+        "provider_id": generate_uuid(),
+        "provider_type": ProviderType.AWS.value,
+    }
+    dedup_index = HostDedupIndex()
+    dedup_index.prefetch(identity.org_id, [canonical_facts])
+
+    assert dedup_index.covers(identity, canonical_facts)
+    assert dedup_index.find_existing_host(identity, canonical_facts) is None
+
+
+def test_dedup_index_doesnt_cover_facts_not_prefetched(db_create_host: Callable[..., Host]):
+    identity = Identity(SYSTEM_IDENTITY)
+    host = db_create_host(host=minimal_db_host(subscription_manager_id=generate_uuid()))
+
+    dedup_index = HostDedupIndex()
+    dedup_index.prefetch(identity.org_id, [{"subscription_manager_id": host.subscription_manager_id}])
+
+    assert not dedup_index.covers(identity, {"subscription_manager_id": generate_uuid()})
+    assert not dedup_index.covers(
+        identity, {"subscription_manager_id": host.subscription_manager_id, "insights_id": generate_uuid()}
+    )
+    assert not dedup_index.covers(
+        Identity(USER_IDENTITY | {"org_id": "other"}), {"subscription_manager_id": host.subscription_manager_id}
+    )
+
+
+def test_dedup_index_prefers_hosts_from_the_batch(db_create_host: Callable[..., Host]):
+    identity = Identity(SYSTEM_IDENTITY)
+    subman_id = generate_uuid()
+    db_create_host(host=minimal_db_host(subscription_manager_id=subman_id))
+
+    dedup_index = HostDedupIndex()
+    dedup_index.prefetch(identity.org_id, [{"subscription_manager_id": subman_id}])
+    batch_host = minimal_db_host(subscription_manager_id=subman_id)
+    dedup_index.add(batch_host)
+
+    assert dedup_index.find_existing_host(identity, {"subscription_manager_id": subman_id}) is batch_host
+
+
+def test_dedup_index_culled_host(db_create_host: Callable[..., Host]):
+    identity = Identity(SYSTEM_IDENTITY)
+    canonical_facts = {"subscription_manager_id": generate_uuid()}
+
+    with patch(
+        "app.models.utils.datetime",
+        **{"now.return_value": datetime.now(tz=UTC) - timedelta(days=100)},
+    ):  # type: ignore [call-overload]
+        db_create_host(host=minimal_db_host(**canonical_facts, reporter="puptoo"))
+
+    dedup_index = HostDedupIndex()
+    dedup_index.prefetch(identity.org_id, [canonical_facts])
+
+    assert dedup_index.covers(identity, canonical_facts)
+    assert dedup_index.find_existing_host(identity, canonical_facts) is None
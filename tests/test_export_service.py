@@ -1,5 +1,6 @@
 import io
 import json
+from copy import deepcopy
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
@@ -12,7 +13,9 @@ from sqlalchemy.orm.exc import ObjectDeletedError
 from app.auth.identity import Identity
 from app.culling import Timestamps
 from app.culling import _Config as CullingConfig
-from app.queue.export_service import _format_export_data
+from app.models import db
+from app.queue.export_service import _iter_export_data
+from app.queue.export_service import _stream_export_data
 from app.queue.export_service import create_export
 from app.queue.export_service import get_host_list
 from app.queue.export_service_mq import parse_export_service_message
@@ -132,7 +135,7 @@ def test_handle_csv_format(flask_app, db_create_host, mocker):
         serialized_host = serialize_host_for_export_svc(
             host, staleness_timestamps=staleness_timestamps, staleness=staleness
         )
-        export_host = _format_export_data([serialized_host], "csv")
+        export_host = "".join(_iter_export_data([serialized_host], "csv"))
 
         csv_file = io.StringIO(export_host)
         mocker.patch("builtins.open", return_value=csv_file)
@@ -152,11 +155,69 @@ def test_handle_json_format(flask_app, db_create_host, mocker):
             host, staleness_timestamps=staleness_timestamps, staleness=staleness
         )
 
-        export_host = json.loads(_format_export_data([serialized_host], "json"))
+        export_host = json.loads("".join(_iter_export_data([serialized_host], "json")))
         mocked_json = es_utils.create_export_json_mock(mocker)
         assert mocked_json == export_host
 
 
+@pytest.mark.parametrize("format", ("json", "csv"))
+def test_stream_export_data_in_batches(format):
+    hosts = [{"id": str(index), "display_name": f"host-{index}", "tags": []} for index in range(5)]
+
+    chunks = list(_stream_export_data(iter(deepcopy(hosts)), format, batch_size=2))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode("utf-8") == "".join(_iter_export_data(deepcopy(hosts), format))
+
+
+@mock.patch("requests.Session.post", autospec=True)
+def test_create_export_streams_upload(mock_post, flask_app, db_create_host, inventory_config):
+    with flask_app.app.app_context():
+        db_create_host()
+        db_create_host()
+        uploaded_chunks = []
+
+        def consume_upload(*_, data, **__):
+            # requests sends a generator body before post() returns
+            assert not isinstance(data, bytes)
+            uploaded_chunks.extend(data)
+            return mock.Mock(status_code=202, text="")
+
+        mock_post.side_effect = consume_upload
+
+        validated_msg = parse_export_service_message(es_utils.create_export_message_mock(format="json"))
+        base64_x_rh_identity = validated_msg["data"]["resource_request"]["x_rh_identity"]
+
+        assert create_export(validated_msg, base64_x_rh_identity, inventory_config)
+        assert len(json.loads(b"".join(uploaded_chunks))) == 2
+
+
+@mock.patch("requests.Session.post", autospec=True)
+def test_create_export_closes_db_session_when_upload_fails(
+    mock_post, flask_app, db_create_host, inventory_config, mocker
+):
+    with flask_app.app.app_context():
+        db_create_host()
+        db_create_host()
+
+        def fail_mid_stream(*_, data, **__):
+            next(iter(data))
+            raise ConnectionError("Connection reset by peer")
+
+        mock_post.side_effect = fail_mid_stream
+        # One piece per upload chunk, so the failure happens before the host query is exhausted
+        mocker.patch.object(inventory_config, "export_svc_batch_size", 1)
+        session_close_spy = mocker.spy(db.session, "close")
+
+        validated_msg = parse_export_service_message(es_utils.create_export_message_mock(format="json"))
+        base64_x_rh_identity = validated_msg["data"]["resource_request"]["x_rh_identity"]
+
+        with pytest.raises(ConnectionError):
+            create_export(validated_msg, base64_x_rh_identity, inventory_config)
+
+        session_close_spy.assert_called()
+
+
 @pytest.mark.usefixtures("enable_rbac")
 @mock.patch("requests.Session.post", autospec=True)
 def test_handle_rbac_allowed(mock_post, subtests, flask_app, db_create_host, mocker, export_service_consumer_mock):
@@ -207,7 +268,7 @@ def test_do_not_export_culled_hosts(flask_app, db_create_host, db_create_stalene
             db_create_host()
 
         identity = Identity(USER_IDENTITY)
-        host_list = get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config)
+        host_list = list(get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config))
 
         assert len(host_list) == 0
 
@@ -216,7 +277,7 @@ def test_export_one_host(flask_app, db_create_host, inventory_config):
     with flask_app.app.app_context():
         db_create_host()
         identity = Identity(USER_IDENTITY)
-        host_list = get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config)
+        host_list = list(get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config))
 
         assert len(host_list) == 1
 
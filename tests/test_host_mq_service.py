@@ -20,16 +20,20 @@ from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm.exc import StaleDataError
 
+from api.staleness_query import get_staleness_obj
 from app.auth.identity import Identity
 from app.auth.identity import create_mock_identity_with_org_id
+from app.common import inventory_config
 from app.culling import CONVENTIONAL_TIME_TO_DELETE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_WARNING_SECONDS
+from app.culling import Timestamps
 from app.exceptions import InventoryException
 from app.exceptions import ValidationException
 from app.logging import threadctx
 from app.models import Host
 from app.models.constants import FAR_FUTURE_STALE_TIMESTAMP
+from app.queue.event_producer import DeliveryReport
 from app.queue.event_producer import EventProducer
 from app.queue.events import EventType
 from app.queue.host_mq import MAX_RETRIES
@@ -39,7 +43,9 @@ from app.queue.host_mq import SystemProfileMessageConsumer
 from app.queue.host_mq import WorkspaceMessageConsumer
 from app.queue.host_mq import _sanitize_json_object_for_postgres
 from app.queue.host_mq import write_add_update_event_message
+from app.queue.host_mq import write_message_batch
 from app.utils import Tag
+from lib import host_repository
 from lib.host_repository import AddHostResult
 from tests.helpers.db_utils import create_reference_host_in_db
 from tests.helpers.db_utils import minimal_db_host
@@ -2494,7 +2500,9 @@ def test_batch_mq_add_host_operations(mocker, event_producer, flask_app):
         }
     )
 
-    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer = IngressMessageConsumer(
+        fake_consumer, flask_app, event_producer, mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    )
     consumer.event_loop(mocker.Mock(side_effect=(False, False, False, True)))
 
     # 12 messages were sent, but it should have only committed three times:
@@ -2538,7 +2546,9 @@ def test_batch_mq_do_dedup_within_batch(
 
     fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
 
-    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer = IngressMessageConsumer(
+        fake_consumer, flask_app, event_producer, mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    )
     consumer.event_loop(mocker.Mock(side_effect=(False, True)))
 
     # Check that only 1 host was created and it contains data from both messages
@@ -2582,7 +2592,9 @@ def test_batch_mq_two_different_hosts(
 
     fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
 
-    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer = IngressMessageConsumer(
+        fake_consumer, flask_app, event_producer, mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    )
     consumer.event_loop(mocker.Mock(side_effect=(False, True)))
 
     # Check that 2 different hosts have the same display_name
@@ -2633,7 +2645,9 @@ def test_batch_mq_do_dedup_in_db(
 
     fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
 
-    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer = IngressMessageConsumer(
+        fake_consumer, flask_app, event_producer, mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    )
     consumer.event_loop(mocker.Mock(side_effect=(False, True)))
 
     # Check that 2 different hosts have the same display_name
@@ -2647,6 +2661,49 @@ def test_batch_mq_do_dedup_in_db(
     assert db_hosts[0].subscription_manager_id == msg_host2["subscription_manager_id"]
 
 
+def test_batch_mq_dedup_prefetches_existing_hosts(
+    mocker: MockerFixture,
+    event_producer: EventProducer,
+    flask_app: FlaskApp,
+    db_get_hosts_by_subman_id: Callable[[str], list[Host]],
+    db_create_host: Callable[..., Host],
+):
+    """The existing hosts for the whole batch are loaded upfront, so no per-host dedup queries are needed."""
+    subman_id = generate_uuid()
+    existing_host = db_create_host(host=minimal_db_host(subscription_manager_id=subman_id))
+
+    msg_hosts = [
+        minimal_host(subscription_manager_id=subman_id, insights_id=generate_uuid()).data(),
+        minimal_host(subscription_manager_id=generate_uuid()).data(),
+        minimal_host(subscription_manager_id=subman_id).data(),
+    ]
+    msgs = [json.dumps(wrap_message(host, "add_host", get_platform_metadata())) for host in msg_hosts]
+
+    mocker.patch(
+        "app.queue.host_mq.inventory_config",
+        return_value=SimpleNamespace(
+            mq_db_batch_max_messages=3,
+            mq_db_batch_max_seconds=1,
+            culling_stale_warning_offset_delta=1,
+            culling_culled_offset_delta=1,
+        ),
+    )
+    find_existing_host_spy = mocker.spy(host_repository, "find_existing_host")
+
+    fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
+
+    consumer = IngressMessageConsumer(
+        fake_consumer, flask_app, event_producer, mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    )
+    consumer.event_loop(mocker.Mock(side_effect=(False, True)))
+
+    find_existing_host_spy.assert_not_called()
+    db_hosts = db_get_hosts_by_subman_id(subman_id)
+    assert len(db_hosts) == 1
+    assert db_hosts[0].id == existing_host.id
+    assert str(db_hosts[0].insights_id) == msg_hosts[0]["insights_id"]
+
+
 def test_batch_mq_header_request_id_updates(mocker, flask_app):
     # Verifies that when messages are sent as part of the same batch,
     # the request_id used in the header is updated correctly.
@@ -2693,21 +2750,67 @@ def test_batch_mq_header_request_id_updates(mocker, flask_app):
         }
     )
 
-    event_producer_mock = mocker.Mock()
+    event_producer_mock = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
     send_notification_patch = mocker.patch("app.queue.host_mq.send_notification")
 
-    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer_mock, mocker.Mock())
+    consumer = IngressMessageConsumer(
+        fake_consumer, flask_app, event_producer_mock, mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    )
     consumer.event_loop(mocker.Mock(side_effect=([False for _ in range(2)] + [True])))
 
-    # Should have been called once per host
+    # Should have been called once per host, with a single flush for the whole batch
     assert send_notification_patch.call_count == 5
-    assert event_producer_mock.write_event.call_count == 5
+    assert event_producer_mock.queue_event.call_count == 5
+    event_producer_mock.write_event.assert_not_called()
+    event_producer_mock.flush_queued.assert_called_once()
 
     for i in range(5):
-        headers = event_producer_mock.write_event.call_args_list[i][0][2]
+        headers = event_producer_mock.queue_event.call_args_list[i][0][2]
         assert headers["request_id"] == request_id_list[i]
 
 
+def test_write_message_batch_counts_delivery_failures(mocker):
+    report = DeliveryReport()
+    report.queued, report.delivered, report.failed = 3, 1, 2
+    event_producer_mock = mocker.Mock(**{"flush_queued.return_value": report})
+    notification_event_producer_mock = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    write_message_mock = mocker.patch("app.queue.host_mq.write_add_update_event_message")
+    delivery_failure_mock = mocker.patch("app.queue.host_mq.metrics.ingress_event_delivery_failure.inc")
+    processed_rows = [mocker.Mock() for _ in range(3)]
+
+    write_message_batch(event_producer_mock, notification_event_producer_mock, processed_rows)
+
+    assert write_message_mock.call_count == 3
+    for call in write_message_mock.call_args_list:
+        assert call.kwargs["wait"] is False
+    event_producer_mock.flush_queued.assert_called_once()
+    notification_event_producer_mock.flush_queued.assert_called_once()
+    delivery_failure_mock.assert_called_once_with(2)
+
+
+def test_write_message_batch_queues_new_host_notifications(mocker, db_create_host):
+    host = db_create_host()
+    result = OperationResult(
+        host,
+        {"request_id": generate_uuid()},
+        Timestamps.from_config(inventory_config()),
+        get_staleness_obj(host.org_id),
+        EventType.created,
+        mocker.Mock(),
+    )
+    event_producer_mock = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+    notification_event_producer_mock = mocker.Mock(**{"flush_queued.return_value": DeliveryReport()})
+
+    write_message_batch(event_producer_mock, notification_event_producer_mock, [result, result])
+
+    # Neither producer blocks per host; each one is flushed once for the whole batch
+    assert notification_event_producer_mock.queue_event.call_count == 2
+    notification_event_producer_mock.write_event.assert_not_called()
+    notification_event_producer_mock.flush_queued.assert_called_once()
+    event_producer_mock.write_event.assert_not_called()
+    event_producer_mock.flush_queued.assert_called_once()
+
+
 def test_batch_mq_graceful_rollback(mocker, flask_app):
     # Verifies that when the DB session runs into a StaleDataError, it's handled gracefully
     # with retry logic and the event loop continues processing instead of crashing the pod
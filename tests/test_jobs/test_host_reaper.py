@@ -432,6 +432,42 @@ def test_delete_all_type_of_hosts(
     assert len(db_get_hosts(conventional_hosts).all()) == 0
 
 
+def test_reaper_applies_each_orgs_staleness_across_chunks(
+    flask_app: FlaskApp,
+    inventory_config: Config,
+    event_producer_mock: MockEventProducer,
+    notification_event_producer_mock: MockEventProducer,
+    db_create_staleness_culling: Callable[..., Staleness],
+    db_create_multiple_hosts: Callable[..., list[Host]],
+    db_create_host: Callable[..., Host],
+    db_get_hosts: Callable[..., Query],
+) -> None:
+    # Only the default org uses custom staleness; the other org falls back to the system default
+    db_create_staleness_culling(**CUSTOM_STALENESS_DELETE)
+
+    with patch("app.models.utils.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime.now(UTC) - timedelta(minutes=1)
+        custom_staleness_hosts = db_create_multiple_hosts(how_many=3, extra_data={"reporter": "puptoo"})
+        custom_staleness_hosts = [host.id for host in custom_staleness_hosts]
+        default_staleness_hosts = [
+            db_create_host(host=minimal_db_host(reporter="puptoo", org_id="other_org")).id for _ in range(2)
+        ]
+
+    threadctx.request_id = None
+    inventory_config.host_delete_chunk_size = 2
+    host_reaper_run(
+        inventory_config,
+        mock.Mock(),
+        db.session,
+        event_producer_mock,
+        notification_event_producer_mock,
+        shutdown_handler=mock.Mock(**{"shut_down.return_value": False}),
+        application=flask_app,
+    )
+    assert len(db_get_hosts(custom_staleness_hosts).all()) == 0
+    assert Host.query.filter(Host.id.in_(default_staleness_hosts)).count() == 2
+
+
 def test_no_hosts_to_delete(
     flask_app: FlaskApp,
     inventory_config: Config,
@@ -32,6 +32,7 @@ from app.queue.host_mq import WorkspaceMessageConsumer
 from lib.host_outbox_events import _collect_pending_ops_for_session
 from lib.outbox_repository import _create_update_event_payload
 from lib.outbox_repository import remove_event_from_outbox
+from lib.outbox_repository import write_delete_events_to_outbox
 from lib.outbox_repository import write_event_to_outbox
 from tests.helpers.api_utils import build_hosts_url
 from tests.helpers.mq_utils import generate_kessel_workspace_message
@@ -132,6 +133,32 @@ class TestOutboxE2ECases:
 
             # The success metric increment proves the outbox entry was created, validated, and processed
 
+    def test_bulk_delete_events_match_single_delete_events(self, db_create_multiple_hosts, mocker):
+        """Test that the bulk 'delete' outbox write inserts exactly what write_event_to_outbox would, once per host."""
+        host_ids = [str(host.id) for host in db_create_multiple_hosts(how_many=3)]
+        columns = ("aggregateid", "aggregatetype", "operation", "version", "payload")
+
+        add_spy = mocker.spy(db.session, "add")
+        for host_id in host_ids:
+            write_event_to_outbox(EventType.delete, host_id)
+        expected_entries = [
+            {column: getattr(call.args[0], column) for column in columns} for call in add_spy.call_args_list
+        ]
+
+        execute_spy = mocker.spy(db.session, "execute")
+        with patch("lib.outbox_repository.outbox_save_success") as mock_success_metric:
+            write_delete_events_to_outbox(host_ids)
+
+        # One multi-row INSERT followed by one DELETE
+        assert execute_spy.call_count == 2
+        inserted_rows = execute_spy.call_args_list[0].args[1]
+        assert [{column: row[column] for column in columns} for row in inserted_rows] == expected_entries
+        assert [row["operation"] for row in inserted_rows] == ["DeleteResource"] * len(host_ids)
+        mock_success_metric.inc.assert_called_once_with(len(host_ids))
+
+        for host_id in host_ids:
+            assert_outbox_empty(db, host_id)
+
     def test_multiple_events_same_host_e2e(self, db_create_host, db_get_host):
         """Test multiple events for the same host create separate outbox entries."""
         # Create a host
@@ -484,6 +484,17 @@ def test_system_profile_sap_sids_with_search(mq_create_or_update_host, api_get):
             assert {item["value"]: item_count} == {item["value"]: expected_counts[item["value"]]}
 
 
+def test_system_profile_sap_sids_pagination(mq_create_or_update_host, api_get):
+    for sap_sids in (["ABC", "HZO", "XYZ"], ["ABC", "XYZ"], ["ABC"], ["DEF"]):
+        mq_create_or_update_host(minimal_host(system_profile={"workloads": {"sap": {"sids": sap_sids}}}))
+
+    response_status, response_data = api_get(build_system_profile_sap_sids_url(query="?per_page=2&page=2"))
+
+    assert response_status == 200
+    assert response_data["total"] == 4
+    assert response_data["results"] == [{"value": "DEF", "count": 1}, {"value": "HZO", "count": 1}]
+
+
 def test_create_empty_update_system_profile(
     mq_create_or_update_host, api_get, db_get_static_system_profile, db_get_dynamic_system_profile
 ):
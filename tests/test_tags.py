@@ -381,6 +381,29 @@ def test_get_tags_with_dollar_signs_via_db(api_get, db_create_host, tag, flatten
     assert flattened_tag == response_data["results"][0]["tag"]
 
 
+def test_get_tags_ordered_by_count_and_paginated_via_db(api_get, db_create_host):
+    db_create_host(extra_data={"tags": _deserialize_tags_dict({"ns1": {"key1": ["val1"], "key2": []}})})
+    db_create_host(extra_data={"tags": _deserialize_tags_dict({"ns1": {"key1": ["val1", "val2"]}})})
+    db_create_host(extra_data={"tags": _deserialize_tags_dict({None: {"key3": ["val3"]}})})
+
+    response_status, response_data = api_get(build_tags_url(query="?order_by=count&order_how=DESC"))
+
+    assert response_status == 200
+    assert response_data["total"] == 4
+    assert response_data["results"] == [
+        {"tag": {"namespace": "ns1", "key": "key1", "value": "val1"}, "count": 2},
+        {"tag": {"namespace": None, "key": "key3", "value": "val3"}, "count": 1},
+        {"tag": {"namespace": "ns1", "key": "key1", "value": "val2"}, "count": 1},
+        {"tag": {"namespace": "ns1", "key": "key2", "value": None}, "count": 1},
+    ]
+
+    response_status, response_data = api_get(build_tags_url(query="?order_by=tag&order_how=DESC&per_page=2&page=2"))
+
+    assert response_status == 200
+    assert response_data["total"] == 4
+    assert [result["tag"]["value"] for result in response_data["results"]] == ["val1", "val3"]
+
+
 def test_query_tags_filter_last_check_in_both_same(db_create_host, api_get):
     match_namespace = "ns1"
     match_key = "key1"
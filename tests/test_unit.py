@@ -2381,6 +2381,86 @@ def test_kafka_exceptions_are_caught_event_producer(message_not_produced_mock, f
         )
 
 
+@patch("app.queue.event_producer.KafkaProducer")
+def test_queue_event_flushes_once_event_producer(flask_app):
+    with flask_app.app.app_context():
+        config = Config(RuntimeEnvironment.TEST)
+        event_producer = EventProducer(config, config.event_topic)
+        produce = event_producer._kafka_producer.produce
+        poll = event_producer._kafka_producer.poll
+        flush = event_producer._kafka_producer.flush
+
+        for _ in range(3):
+            host_id = str(uuid4())
+            event_producer.queue_event(build_event(EventType.created, {"id": host_id}), host_id, {})
+
+        assert produce.call_count == 3
+        poll.assert_called_with(0)
+        flush.assert_not_called()
+
+        # Simulate the delivery reports served by librdkafka: two delivered, one failed
+        callbacks = [call.kwargs["callback"] for call in produce.call_args_list]
+        error = Mock(**{"code.return_value": None})
+        with (
+            patch("app.queue.event_producer.message_produced"),
+            patch("app.queue.event_producer.message_not_produced"),
+        ):
+            callbacks[0](None, "message")
+            callbacks[1](error, "message")
+            callbacks[2](None, "message")
+
+        report = event_producer.flush_queued()
+
+        flush.assert_called_once()
+        assert (report.queued, report.delivered, report.failed) == (3, 2, 1)
+
+        # The next batch starts with a clean report
+        assert event_producer.flush_queued().queued == 0
+
+
+@patch("app.queue.event_producer.KafkaProducer")
+def test_flush_queued_reports_in_flight_events_as_failed_event_producer(flask_app):
+    with flask_app.app.app_context():
+        config = Config(RuntimeEnvironment.TEST)
+        event_producer = EventProducer(config, config.event_topic)
+        produce = event_producer._kafka_producer.produce
+        # The flush times out with one message still in the local queue
+        event_producer._kafka_producer.flush.return_value = 1
+
+        for _ in range(2):
+            host_id = str(uuid4())
+            event_producer.queue_event(build_event(EventType.created, {"id": host_id}), host_id, {})
+
+        callbacks = [call.kwargs["callback"] for call in produce.call_args_list]
+        with patch("app.queue.event_producer.message_produced"):
+            callbacks[0](None, "message")
+
+        report = event_producer.flush_queued(timeout=1)
+
+        assert (report.queued, report.delivered, report.failed) == (2, 1, 1)
+
+        # A late delivery report does not change the report that was already returned
+        with patch("app.queue.event_producer.message_produced"):
+            callbacks[1](None, "message")
+        assert (report.delivered, report.failed) == (1, 1)
+
+
+@patch("app.queue.event_producer.KafkaProducer")
+def test_queue_event_retries_when_local_queue_is_full_event_producer(flask_app):
+    with flask_app.app.app_context():
+        config = Config(RuntimeEnvironment.TEST)
+        event_producer = EventProducer(config, config.event_topic)
+        produce = event_producer._kafka_producer.produce
+        produce.side_effect = [BufferError(), None]
+
+        host_id = str(uuid4())
+        event_producer.queue_event(build_event(EventType.created, {"id": host_id}), host_id, {})
+
+        assert produce.call_count == 2
+        event_producer._kafka_producer.poll.assert_any_call(1)
+        assert event_producer.flush_queued().queued == 1
+
+
 @pytest.fixture
 def normalizer(flask_app):
     with flask_app.app.app_context():
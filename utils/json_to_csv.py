@@ -11,17 +11,17 @@ def _tags_to_string(tags_arr):
     return f"{tags_str}"
 
 
-def json_arr_to_csv(json_arr_data):
-    # Prepare a buffer to store the CSV data
+def json_iter_to_csv(json_iter):
+    # Yields the CSV document one row at a time, so that the whole export never has to be held in memory
     output = io.StringIO()
     writer = csv.writer(output, quoting=csv.QUOTE_NONNUMERIC)
-    writer.writerow(json_arr_data[0].keys())
-    for host in json_arr_data:
+    for index, host in enumerate(json_iter):
+        if index == 0:
+            writer.writerow(host.keys())
         host["tags"] = _tags_to_string(host["tags"])
         # Write the data row
         writer.writerow(host.values())
 
-    # Get the CSV string from the buffer
-    csv_string = output.getvalue()
-
-    return csv_string
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()